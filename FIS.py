@@ -1,9 +1,67 @@
 import fuzzylite as fl
+from functools import lru_cache
+from itertools import chain, repeat
 from typing import Iterable, Union, Literal
-import matplotlib.pyplot as plt
 import numpy as np
 
 
+# Default operators, created on first use and shared by all the FIS
+_DEFAULTS: dict[type, object] = {}
+
+
+def _default(cls: type) -> object:
+    """
+    Get the shared default instance of a stateless fuzzylite operator.
+
+    Parameters
+    ----------
+    cls : type
+        The class of the operator, e.g. fl.Minimum.
+
+    Returns
+    -------
+    object
+        The instance of the class, created the first time it is needed.
+    """
+
+    if cls not in _DEFAULTS:
+        _DEFAULTS[cls] = cls()
+    return _DEFAULTS[cls]
+
+
+@lru_cache(maxsize=128)
+def _grid(
+    minimum: Union[int, float] = 0,
+    maximum: Union[int, float] = 1,
+    n: int = 100,
+) -> np.ndarray:
+    """
+    Get the evaluation grid of a universe, shared by all the plots, as
+    offsets from its minimum.
+
+    Parameters
+    ----------
+    minimum : Union[int, float], optional
+        The minimum value of the universe of the variable.
+    maximum : Union[int, float], optional
+        The maximum value of the universe of the variable.
+    n : int, optional
+        The number of points of the grid.
+
+    Returns
+    -------
+    np.ndarray
+        The read-only grid of n values between minimum and maximum, minus
+        minimum. It is float32, as the plots do not need more precision
+        and it halves the memory the membership evaluation goes through.
+        The offsets keep that precision in universes far from zero.
+    """
+
+    xs = (np.linspace(minimum, maximum, n) - minimum).astype(np.float32)
+    xs.setflags(write=False)
+    return xs
+
+
 class FIS:
     def __init__(
         self,
@@ -41,15 +99,19 @@ class FIS:
         # Initialize Output Inference
         self.output: Union[int, float] = 0.0
 
+        # Initialize Variable Names already added
+        self._input_names: set[str] = set()
+        self._output_names: set[str] = set()
+
     def create_rule_block(
         self,
         rule_name: str = "",
         rule_description: str = "",
         enabled: bool = True,
-        rule_conjunction: fl.TNorm | None = fl.Minimum(),
-        rule_disjunction: fl.SNorm | None = fl.Maximum(),
-        rule_implication: fl.TNorm | None = fl.AlgebraicProduct(),
-        rule_activation: fl.Activation | None = fl.General(),
+        rule_conjunction: fl.TNorm | None = None,
+        rule_disjunction: fl.SNorm | None = None,
+        rule_implication: fl.TNorm | None = None,
+        rule_activation: fl.Activation | None = None,
         rules: Iterable[fl.Rule] | None = None,
     ) -> None:
         """
@@ -66,20 +128,22 @@ class FIS:
         rule_conjunction: fl.TNorm, optional
             Defines the conjunction operator. The conjunction operator
             is used to combine the antecedents of the rules with the
-            AND operator.
+            AND operator. The default is the minimum.
         rule_disjunction: fl.SNorm, optional
             Defines the disjunction operator. The disjunction operator
             is used to combine the antecedents of the rules with the
-            OR operator.
+            OR operator. The default is the maximum.
         rule_implication: fl.TNorm, optional
             Defines the implication. The implication, in fuzzy logic,
             is the degree of a consequent given an antecedent. It can
-            be expressed with IF X THEN Y.
+            be expressed with IF X THEN Y. The default is the algebraic
+            product.
         rule_activation: fl.Activation, optional
             Defines the type of activation for the rules. The activation
             is the process of combining the degree of support of the
             antecedents with the implication to obtain the degree of
-            support of the consequent.
+            support of the consequent. The default is the general
+            activation.
         rules: Iterable[fl.Rule], optional
             Defines the rules of the rule block. The rules are the
             basic building blocks of a Fuzzy Inference System. Each
@@ -89,6 +153,16 @@ class FIS:
             that is taken when the antecedent is satisfied.
         """
 
+        # Use the default operators, they have no state to share
+        if rule_conjunction is None:
+            rule_conjunction = _default(fl.Minimum)
+        if rule_disjunction is None:
+            rule_disjunction = _default(fl.Maximum)
+        if rule_implication is None:
+            rule_implication = _default(fl.AlgebraicProduct)
+        if rule_activation is None:
+            rule_activation = _default(fl.General)
+
         # Set the common rule block value
         self.rule_block = fl.RuleBlock(
             name=rule_name,
@@ -118,13 +192,11 @@ class FIS:
         """
 
         # Check if the variable name is repeated
-        if not self._is_valid_variable_name(
-            variable.name,
-            self.engine.input_variables,
-        ):
+        if not self._is_valid_variable_name(variable.name, "input"):
             raise ValueError("variable_name's need to be different.")
 
         self.engine.input_variables.append(variable)
+        self._input_names.add(variable.name)
 
     def add_output_variable(self, variable: fl.OutputVariable = None) -> None:
         """
@@ -137,18 +209,16 @@ class FIS:
         """
 
         # Check if the variable name is repeated
-        if not self._is_valid_variable_name(
-            variable.name,
-            self.engine.output_variables,
-        ):
+        if not self._is_valid_variable_name(variable.name, "output"):
             raise ValueError("variable_name's need to be different.")
 
         self.engine.output_variables.append(variable)
+        self._output_names.add(variable.name)
 
     def _is_valid_variable_name(
         self,
         variable_name: str = "",
-        set_variable_name: Iterable = [],
+        kind: Literal["input", "output"] = "input",
     ) -> bool:
         """
         Helper function to avoid repeated variables in the FIS.
@@ -157,8 +227,8 @@ class FIS:
         ----------
         variable_name : str
             The name of the variable to check.
-        set_variable_name : Iterable
-            The variables already added to the FIS.
+        kind : Literal["input", "output"]
+            The kind of variables already added to the FIS to check against.
 
         Returns
         -------
@@ -166,12 +236,15 @@ class FIS:
             True if the variable name is valid, False otherwise.
         """
 
-        for i in range(len(set_variable_name)):
-            name = set_variable_name[i].name
-            if name == variable_name:
-                return False
+        names = getattr(self, f"_{kind}_names")
+        variables = getattr(self.engine, f"{kind}_variables")
+
+        # Rebuild the names if variables were added to the engine directly
+        if len(names) != len(variables):
+            names.clear()
+            names.update(variable.name for variable in variables)
 
-        return True
+        return variable_name not in names
 
     def create_output_variable(
         self,
@@ -182,8 +255,8 @@ class FIS:
         variable_maximum: Union[int, float] = 1,
         ratio: float = 0.5,
         lock_range: bool = False,
-        aggregation: fl.SNorm | None = fl.Maximum(),
-        defuzzifier: fl.Defuzzifier | None = fl.Centroid(50),
+        aggregation: fl.SNorm | None = None,
+        defuzzifier: fl.Defuzzifier | None = None,
         variable_labels: Iterable[fl.Term] = ["low", "average", "high"],
         auto_mf_type: Literal["triangular", "gaussian", "trapezoid"] = None,
         terms: Iterable[fl.Term] = None,
@@ -215,7 +288,8 @@ class FIS:
         aggregation: fl.SNorm, optional
             Defines the aggregation operator. The aggregation operator
             is used to combine the consequents of the rules with the
-            selected operator in the rule block.
+            selected operator in the rule block. The default is the
+            maximum.
         defuzzifier: fl.Defuzzifier, optional
             Defines the defuzzifier. The defuzzifier is the process of
             converting the fuzzy output into a crisp value. The default
@@ -250,77 +324,38 @@ class FIS:
                 "If none membership functions is declared, terms need to be added."
             )
 
-        # Return the terms added
-        if auto_mf_type == None and terms != None:
-            return fl.OutputVariable(
-                name=variable_name,
-                description=variable_description,
-                enabled=enable,
-                minimum=variable_minimum,
-                maximum=variable_maximum,
-                lock_range=lock_range,
-                aggregation=aggregation,
-                defuzzifier=defuzzifier,
-                terms=terms,
-            )
-
-        # Return Triangular Membership Function
-        if auto_mf_type == "triangular":
-            return fl.OutputVariable(
-                name=variable_name,
-                description=variable_description,
-                enabled=enable,
-                minimum=variable_minimum,
-                maximum=variable_maximum,
-                lock_range=lock_range,
-                aggregation=aggregation,
-                defuzzifier=defuzzifier,
-                terms=self._create_triangular_mf(
-                    variable_labels,
-                    variable_minimum,
-                    variable_maximum,
-                    overlap,
-                ),
-            )
+        # Use the default aggregation, but a defuzzifier per variable as
+        # its resolution can be changed
+        if aggregation is None:
+            aggregation = _default(fl.Maximum)
+        if defuzzifier is None:
+            defuzzifier = fl.Centroid(50)
+
+        # Set the common variable values
+        kwargs = dict(
+            name=variable_name,
+            description=variable_description,
+            enabled=enable,
+            minimum=variable_minimum,
+            maximum=variable_maximum,
+            lock_range=lock_range,
+            aggregation=aggregation,
+            defuzzifier=defuzzifier,
+        )
 
-        # Return Gaussian Membership Function
-        if auto_mf_type == "gaussian":
-            return fl.OutputVariable(
-                name=variable_name,
-                description=variable_description,
-                enabled=enable,
-                minimum=variable_minimum,
-                maximum=variable_maximum,
-                lock_range=lock_range,
-                aggregation=aggregation,
-                defuzzifier=defuzzifier,
-                terms=self._create_gaussian_mf(
-                    variable_labels,
-                    variable_minimum,
-                    variable_maximum,
-                    overlap,
-                ),
+        # Create the automatic membership functions
+        if auto_mf_type != None:
+            terms = self._create_auto_mf(
+                auto_mf_type,
+                variable_labels,
+                variable_minimum,
+                variable_maximum,
+                ratio,
+                overlap,
             )
 
-        # Return Trapezoid Membership Function
-        if auto_mf_type == "trapezoid":
-            return fl.OutputVariable(
-                name=variable_name,
-                description=variable_description,
-                enabled=enable,
-                minimum=variable_minimum,
-                maximum=variable_maximum,
-                lock_range=lock_range,
-                aggregation=aggregation,
-                defuzzifier=defuzzifier,
-                terms=self._create_trapezoid_mf(
-                    variable_labels,
-                    variable_minimum,
-                    variable_maximum,
-                    ratio,
-                    overlap,
-                ),
-            )
+        kwargs["terms"] = terms
+        return fl.OutputVariable(**kwargs)
 
     def create_input_variable(
         self,
@@ -389,70 +424,78 @@ class FIS:
                 "If none membership functions is declared, terms need to be added."
             )
 
-        # Return the terms added
-        if auto_mf_type == None and terms != None:
-            return fl.InputVariable(
-                name=variable_name,
-                description=variable_description,
-                enabled=enable,
-                minimum=variable_minimum,
-                maximum=variable_maximum,
-                lock_range=lock_range,
-                terms=terms,
-            )
+        # Set the common variable values
+        kwargs = dict(
+            name=variable_name,
+            description=variable_description,
+            enabled=enable,
+            minimum=variable_minimum,
+            maximum=variable_maximum,
+            lock_range=lock_range,
+        )
 
-        # Return Triangular Membership Function
-        if auto_mf_type == "triangular":
-            return fl.InputVariable(
-                name=variable_name,
-                description=variable_description,
-                enabled=enable,
-                minimum=variable_minimum,
-                maximum=variable_maximum,
-                lock_range=lock_range,
-                terms=self._create_triangular_mf(
-                    variable_labels,
-                    variable_minimum,
-                    variable_maximum,
-                    overlap,
-                ),
+        # Create the automatic membership functions
+        if auto_mf_type != None:
+            terms = self._create_auto_mf(
+                auto_mf_type,
+                variable_labels,
+                variable_minimum,
+                variable_maximum,
+                ratio,
+                overlap,
             )
 
-        # Return Gaussian Membership Function
-        if auto_mf_type == "gaussian":
-            return fl.InputVariable(
-                name=variable_name,
-                description=variable_description,
-                enabled=enable,
-                minimum=variable_minimum,
-                maximum=variable_maximum,
-                lock_range=lock_range,
-                terms=self._create_gaussian_mf(
-                    variable_labels,
-                    variable_minimum,
-                    variable_maximum,
-                    overlap,
-                ),
-            )
+        kwargs["terms"] = terms
+        return fl.InputVariable(**kwargs)
 
-        # Return Trapezoid Membership Function
-        if auto_mf_type == "trapezoid":
-            return fl.InputVariable(
-                name=variable_name,
-                description=variable_description,
-                enabled=enable,
-                minimum=variable_minimum,
-                maximum=variable_maximum,
-                lock_range=lock_range,
-                terms=self._create_trapezoid_mf(
-                    variable_labels,
-                    variable_minimum,
-                    variable_maximum,
-                    ratio,
-                    overlap,
-                ),
+    def _create_auto_mf(
+        self,
+        auto_mf_type: Literal["triangular", "gaussian", "trapezoid"] = "triangular",
+        labels: Iterable[fl.Term] = ["low", "average", "high"],
+        minimum: Union[int, float] = 0,
+        maximum: Union[int, float] = 1,
+        ratio: float = 0.5,
+        overlap: Union[int, float] = 0,
+    ) -> Iterable[fl.Term]:
+        """
+        Helper function to create membership functions of a given type.
+
+        Parameters
+        ----------
+        auto_mf_type : Literal["triangular", "gaussian", "trapezoid"], optional
+            The type of the membership functions.
+        labels : Iterable[fl.Term], optional
+            The labels of the membership functions.
+        minimum : Union[int, float], optional
+            The minimum value of the universe of the variable.
+        maximum : Union[int, float], optional
+            The maximum value of the universe of the variable.
+        ratio : float, optional
+            The ratio of the top of the trapezoid, only for trapezoid.
+        overlap : Union[int, float], optional
+            The overlap between the membership functions.
+
+        Returns
+        -------
+        Iterable[fl.Term]
+            The membership functions created.
+        """
+
+        # Membership function helpers and their extra arguments
+        builders = {
+            "triangular": (self._create_triangular_mf, (overlap,)),
+            "gaussian": (self._create_gaussian_mf, (overlap,)),
+            "trapezoid": (self._create_trapezoid_mf, (ratio, overlap)),
+        }
+
+        if auto_mf_type not in builders:
+            raise ValueError(
+                "auto_mf_type needs to be triangular, gaussian or trapezoid."
             )
 
+        builder, extra_args = builders[auto_mf_type]
+        return builder(labels, minimum, maximum, *extra_args)
+
     def _create_gaussian_mf(
         self,
         labels: Iterable[fl.Term] = ["low", "average", "high"],
@@ -507,27 +550,27 @@ class FIS:
         range_size = maximum - minimum
         step = range_size / n
 
-        mfs = []
-        for i, label in enumerate(labels):
-            if i == 0:
-                c = minimum + step * (1 + overlap)
-                mean = minimum
-                std_dev = (mean - c) / 3
-
-            elif i == n - 1:
-                a = minimum + step * (i - overlap)
-                mean = maximum
-                std_dev = (mean - a) / 3
-            else:
-                a = minimum + step * (i + 0 - overlap)
-                c = minimum + step * (i + 1 + overlap)
-                b = 0.5 * (c + a)
-                mean = b
-                std_dev = (mean - c) / 3
-
-            mfs.append(fl.Gaussian(label, mean, std_dev))
-
-        return mfs
+        # Compute the A and C points of every label at once
+        idx = np.arange(n, dtype=np.float64)
+        a = minimum + step * (idx - overlap)
+        c = minimum + step * (idx + 1 + overlap)
+        mean = 0.5 * (c + a)
+
+        # The edge labels are centered on the universe limits
+        mean[-1] = maximum
+        mean[0] = minimum
+
+        # The last label takes the left side, the rest the right side
+        std_dev = (mean - c) / 3
+        std_dev[-1] = (mean[-1] - a[-1]) / 3
+        std_dev[0] = (mean[0] - c[0]) / 3
+
+        return [
+            fl.Gaussian(label, mean_i, std_dev_i)
+            for label, mean_i, std_dev_i in zip(
+                labels, mean.tolist(), std_dev.tolist()
+            )
+        ]
 
     def _create_trapezoid_mf(
         self,
@@ -590,32 +633,34 @@ class FIS:
         range_size = maximum - minimum
         step = range_size / n
 
-        mfs = []
-        for i, label in enumerate(labels):
-            if i == 0:
-                a = minimum
-                b = minimum
-                d = minimum + step * (1 + overlap)
-                half_top = ratio * (d - a)
-                c = minimum + half_top
-            elif i == n - 1:
-                a = minimum + step * (i - overlap)
-                c = maximum
-                d = maximum
-                b = (a + d) * ratio
-            else:
-                a = minimum + step * (i + 0 - overlap)
-                d = minimum + step * (i + 1 + overlap)
-                mid = (d + a) * 0.5
-                # ratio * (d - a) # size of top side
-                # (d - a)         # size of bottom side
-                half_top = ratio * (d - a) * 0.5
-                b = mid - half_top
-                c = mid + half_top
-
-            mfs.append(fl.Trapezoid(label, a, b, c, d))
-
-        return mfs
+        # Compute the A and D points of every label at once
+        idx = np.arange(n, dtype=np.float64)
+        a = minimum + step * (idx - overlap)
+        d = minimum + step * (idx + 1 + overlap)
+        mid = (d + a) * 0.5
+        # ratio * (d - a) # size of top side
+        # (d - a)         # size of bottom side
+        half_top = ratio * (d - a) * 0.5
+        b = mid - half_top
+        c = mid + half_top
+
+        # The last label is a shoulder on the maximum
+        c[-1] = maximum
+        d[-1] = maximum
+        b[-1] = (a[-1] + d[-1]) * ratio
+
+        # The first label is a shoulder on the minimum
+        a[0] = minimum
+        b[0] = minimum
+        d[0] = minimum + step * (1 + overlap)
+        c[0] = minimum + ratio * (d[0] - a[0])
+
+        return [
+            fl.Trapezoid(label, a_i, b_i, c_i, d_i)
+            for label, a_i, b_i, c_i, d_i in zip(
+                labels, a.tolist(), b.tolist(), c.tolist(), d.tolist()
+            )
+        ]
 
     def _create_triangular_mf(
         self,
@@ -664,26 +709,32 @@ class FIS:
         range_size = maximum - minimum
         step = range_size / n
 
-        mfs = []
-        for i, label in enumerate(labels):
-            if i == 0:
-                a = minimum
-                b = minimum
-                c = minimum + step * (1 + overlap)
-            elif i == n - 1:
-                a = minimum + step * (i - overlap)
-                b = maximum
-                c = maximum
-            else:
-                a = minimum + step * (i + 0 - overlap)
-                c = minimum + step * (i + 1 + overlap)
-                b = 0.5 * (c + a)
+        # Compute the A, B and C points of every label at once
+        idx = np.arange(n, dtype=np.float64)
+        a = minimum + step * (idx - overlap)
+        c = minimum + step * (idx + 1 + overlap)
+        b = 0.5 * (c + a)
+
+        # The last label is a shoulder on the maximum
+        b[-1] = maximum
+        c[-1] = maximum
 
-            mfs.append(fl.Triangle(label, a, b, c))
+        # The first label is a shoulder on the minimum
+        a[0] = minimum
+        b[0] = minimum
+        c[0] = minimum + step * (1 + overlap)
 
-        return mfs
+        return [
+            fl.Triangle(label, a_i, b_i, c_i)
+            for label, a_i, b_i, c_i in zip(labels, a.tolist(), b.tolist(), c.tolist())
+        ]
 
-    def add_rules_from_list(self, rule_list: Iterable[str] = None) -> None:
+    def add_rules_from_list(
+        self,
+        rule_list: Iterable[str] = None,
+        cache: dict[str, fl.Rule] | None = None,
+        normalize: bool = False,
+    ) -> None:
         """
         Add rules to the rule block from a given set of rules.
 
@@ -691,66 +742,326 @@ class FIS:
         __________
         rule_list: Iterable[str]
             Set of rules given as an array of strings.
+        cache: dict[str, fl.Rule], optional
+            Rules already parsed, indexed by their string. The rules
+            not found are parsed and added to it, so calling this
+            method again with the same cache skips parsing them. As
+            the rules keep references to the variables of the FIS,
+            the cache can only be reused with the same FIS.
+        normalize: bool, optional
+            Defines if the whitespace of the rules is collapsed to single
+            spaces before parsing them, so rules that only differ in
+            spacing are parsed once when using a cache.
 
         Example
         _______
             my_rules = ["if var1 is low then out1 is high", "if var2 is high then out1 is low",]
         """
-        # Clear the rules in the rule blocks
-        self.rule_block.rules = []
+        create = fl.Rule.create
+        engine = self.engine
+
+        # Collapse the whitespace once, before the parser
+        if normalize:
+            rule_list = [" ".join(rule.split()) for rule in rule_list]
+
+        # Assign the rules to the rule_block, replacing the previous ones
+        if cache is None:
+            self.rule_block.rules = [create(rule, engine) for rule in rule_list]
+            return
 
-        # Assign the rules to the rule_block
+        rules = []
         for rule in rule_list:
-            self.rule_block.rules.append(fl.Rule.create(rule, self.engine))
+            if rule not in cache:
+                cache[rule] = create(rule, engine)
+            rules.append(cache[rule])
+        self.rule_block.rules = rules
 
     def inference(self, inputs: Iterable[Union[int, float]] = None) -> None:
+        input_vars = self.engine.input_variables
+
+        # Check the inputs match the input variables, before assigning any
+        if len(inputs) != len(input_vars):
+            raise ValueError("inputs need one value per input variable.")
+
         # Assign the input variables
-        n = len(inputs)
-        inputs_name = self.get_input_variable_names()
-        for i in range(n):
-            str_input = inputs_name[i]
-            self.engine.input_variable(str_input).value = inputs[i]
+        for variable, value in zip(input_vars, inputs):
+            variable.value = value
 
         # Do the inference
         self.engine.process()
 
         # Assign the output variables
-        output_name = self.get_output_variable_names()
-        self.output = self.engine.output_variable(output_name[0]).value
+        self.output = self.engine.output_variables[0].value
+
+    def inference_batch(self, inputs: np.ndarray = None) -> np.ndarray:
+        """
+        Do the inference for several sets of inputs at once.
+
+        Parameters
+        __________
+        inputs: np.ndarray
+            Array with one row per inference and one column per input
+            variable, in the order they were added to the FIS.
+
+        Returns
+        _______
+        np.ndarray
+            The value of the first output variable for each row.
+
+        Example
+        _______
+            outputs = fis.inference_batch(np.array([[6.5, 9.8], [2.0, 3.5]]))
+        """
+        inputs = np.asarray(inputs, dtype=np.float64)
+
+        # Check the inputs match the input variables
+        input_vars = self.engine.input_variables
+        if inputs.ndim != 2 or inputs.shape[1] != len(input_vars):
+            raise ValueError("inputs need one column per input variable.")
+
+        # Resolve the variables and the engine once for all the rows
+        output_var = self.engine.output_variables[0]
+        process = self.engine.process
+
+        outputs = np.empty(inputs.shape[0], dtype=np.float64)
+        for r, row in enumerate(inputs.tolist()):
+            for variable, value in zip(input_vars, row):
+                variable.value = value
+            process()
+            outputs[r] = np.asarray(output_var.value).item()
+
+        return outputs
 
     def get_input_variable_names(self) -> Iterable[str]:
+        """
+        Get the name of the input variables.
+        """
+        return [variable.name for variable in self.engine.input_variables]
+
+    def get_output_variable_names(self) -> Iterable[str]:
         """
         Get the name of the output variables.
         """
-        # How many input variables?
-        n = len(self.engine.input_variables)
+        return [variable.name for variable in self.engine.output_variables]
+
+    # JUST FOR VISUALIZATION, THIS CAN BE CUSTOMIZED
+
+    def _pack_terms(
+        self,
+        variable: fl.Variable = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Helper function to pack the membership functions of a variable.
+
+        Parameters
+        ----------
+        variable : fl.Variable
+            The variable with the membership functions to pack.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The kind of each term (0 for triangle, 1 for gaussian, 2 for
+            trapezoid and -1 for any other shape, or for a term with
+            infinite breakpoints, which fuzzylite evaluates with its own
+            cases) and a (n_terms, 7) float32 array with the parameters
+            of each term, one row per term, relative to the minimum of
+            the variable to match the plotting grid (see _grid):
+                Triangle:  A, B, C, NaN, height, 1 / (B - A), 1 / (C - B)
+                Gaussian:  mean, std_dev, NaN, NaN, height,
+                           1 / (2 * std_dev^2), NaN
+                Trapezoid: A, B, C, D, height, 1 / (B - A), 1 / (D - C)
+            The reciprocals are computed once here, so the evaluation
+            multiplies instead of dividing. They are inf for vertical
+            shoulders (A = B or C = D).
+        """
 
-        # Save names
-        names = []
-        for i in range(n):
-            names.append(self.engine.input_variables[i].name)
+        n = len(variable.terms)
+        kinds = np.full(n, -1, dtype=np.int8)
+        params = np.full((n, 7), np.nan, dtype=np.float32)
+
+        # Breakpoints are shifted in float64, before the float32 cast
+        lo = variable.minimum
+        for j, term in enumerate(variable.terms):
+            if isinstance(term, fl.Triangle):
+                kinds[j] = 0
+                params[j, :3] = (term.left - lo, term.top - lo, term.right - lo)
+            elif isinstance(term, fl.Gaussian):
+                kinds[j] = 1
+                params[j, :2] = (term.mean - lo, term.standard_deviation)
+            elif isinstance(term, fl.Trapezoid):
+                kinds[j] = 2
+                params[j, :4] = (
+                    term.bottom_left - lo,
+                    term.top_left - lo,
+                    term.top_right - lo,
+                    term.bottom_right - lo,
+                )
+            else:
+                continue
+            params[j, 4] = term.height
 
-        # Return names
-        return names
+            # Infinite breakpoints give inf * 0 slopes, left to fuzzylite
+            if np.isinf(params[j, :4]).any():
+                kinds[j] = -1
+                params[j] = np.nan
 
-    def get_output_variable_names(self) -> Iterable[str]:
+        # Reciprocals of the slopes, and of the gaussian variance
+        a, b, c, d = params[:, :4].T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            params[:, 5] = np.where(kinds == 1, 0.5 / b**2, 1.0 / (b - a))
+            params[:, 6] = np.where(kinds == 0, 1.0 / (c - b), 1.0 / (d - c))
+        params[kinds == 1, 6] = np.nan
+        params[kinds == -1, 5:] = np.nan
+
+        return kinds, params
+
+    def _vec_membership(
+        self,
+        variable: fl.Variable = None,
+        xs: np.ndarray = None,
+    ) -> np.ndarray:
         """
-        Get the name of the input variables.
+        Helper function to evaluate the membership functions of a variable
+        over a grid.
+
+        Parameters
+        ----------
+        variable : fl.Variable
+            The variable with the membership functions to evaluate.
+        xs : np.ndarray
+            The values where the membership functions are evaluated, as
+            offsets from the minimum of the variable, see _grid.
+
+        Returns
+        -------
+        np.ndarray
+            A (len(xs), n_terms) array with the membership values of each
+            term, in the same order as the terms of the variable.
+
+        Mathematical Explanation
+        ------------------------
+
+        The shapes created by this class are evaluated in closed form
+        over the whole grid, following the same cases of fuzzylite:
+            Triangle:  min((x - A) / (B - A), (C - x) / (C - B))
+            Trapezoid: min((x - A) / (B - A), 1, (D - x) / (D - C))
+            Gaussian:  exp(-(x - mean)^2 / (2 * std_dev^2))
+        Values outside [A, C] (or [A, D]) are 0. All the terms of the same
+        shape are evaluated together, broadcasting the grid as a column
+        against one row of parameters per term. Triangles are evaluated
+        as trapezoids with B = C, together with the trapezoids.
+        Any other shape is evaluated with the membership of fuzzylite over
+        the whole grid, or point by point if it only accepts scalars.
         """
-        # How many output variables?
-        n = len(self.engine.output_variables)
 
-        # Save names
-        names = []
-        for i in range(n):
-            names.append(self.engine.output_variables[i].name)
+        # Packed again on every call, so edited terms are always current
+        kinds, params = self._pack_terms(variable)
+
+        xs = np.ascontiguousarray(xs, dtype=np.float32)
+        x = xs[:, None]
+        mu = np.empty((len(xs), len(kinds)), dtype=np.float32)
+
+        # Shoulders (A = B or C = D) give inf slopes in unused branches
+        with np.errstate(invalid="ignore"):
+            # A triangle is a trapezoid with B = C, so all the piecewise
+            # linear terms share a single expression
+            linear = (kinds == 0) | (kinds == 2)
+            if linear.any():
+                a, b, c, d, height, rise, fall = params[linear].T
+                triangle = kinds[linear] == 0
+                c, d = np.where(triangle, b, c), np.where(triangle, c, d)
+                y = np.where(
+                    x < b,
+                    (x - a) * rise,
+                    np.where(x > c, (d - x) * fall, 1.0),
+                )
+                mu[:, linear] = height * np.where((x < a) | (x > d), 0.0, y)
+
+            gaussian = kinds == 1
+            if gaussian.any():
+                mean, _, _, _, height, scale, _ = params[gaussian].T
+                mu[:, gaussian] = height * np.exp(-np.square(x - mean) * scale)
+
+        # Other shapes are evaluated by fuzzylite over the actual values
+        values = variable.minimum + xs.astype(np.float64)
+        for j in np.flatnonzero(kinds == -1).tolist():
+            term = variable.terms[j]
+            try:
+                y = np.asarray(term.membership(values), dtype=np.float32)
+            except (TypeError, ValueError):
+                y = None
+            if y is None or y.shape != xs.shape:
+                y = np.fromiter(
+                    (term.membership(x_i) for x_i in values),
+                    dtype=np.float32,
+                    count=xs.size,
+                )
+            mu[:, j] = y
+
+        return mu
 
-        # Return names
-        return names
+    def _plot_data(
+        self,
+        variable: fl.Variable = None,
+        n: int = 100,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Helper function to get the curves to plot for a variable.
 
-    # JUST FOR VISUALIZATION, THIS CAN BE CUSTOMIZED
+        Parameters
+        ----------
+        variable : fl.Variable
+            The variable with the membership functions to plot.
+        n : int, optional
+            The number of points of the grid.
 
-    def plot_membership_functions(self, variable_name: str) -> None:
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The grid over the universe of the variable, in float64, and
+            the membership values of each term, see _vec_membership.
+        """
+
+        offsets = _grid(variable.minimum, variable.maximum, n)
+        mu = self._vec_membership(variable, offsets)
+        return variable.minimum + offsets.astype(np.float64), mu
+
+    def _plot_terms(
+        self,
+        ax: "matplotlib.axes.Axes" = None,
+        variable: fl.Variable = None,
+    ) -> list:
+        """
+        Helper function to draw the membership functions of a variable.
+
+        Parameters
+        ----------
+        ax : matplotlib.axes.Axes
+            The axes to draw on.
+        variable : fl.Variable
+            The variable with the membership functions to draw.
+
+        Returns
+        -------
+        list
+            The line of each term, labeled with its name, to use as
+            legend handles.
+        """
+        xs, mu = self._plot_data(variable)
+
+        # A single call draws one line per column of mu
+        lines = ax.plot(xs, mu)
+        for line, term in zip(lines, variable.terms):
+            line.set_label(term.name)
+
+        return lines
+
+    def plot_membership_functions(
+        self,
+        variable_name: str,
+        ax: "matplotlib.axes.Axes | None" = None,
+    ) -> None:
         """
         Plot the membership functions of a given variable.
 
@@ -758,137 +1069,135 @@ class FIS:
         ----------
         variable_name : str
             The name of the variable to plot.
+        ax : matplotlib.axes.Axes, optional
+            Axes to draw on, cleared before plotting. If given, the plot
+            is not shown, so the caller can reuse the same figure. If
+            not given, a new figure is created and shown.
         """
+        import matplotlib.pyplot as plt
+
         variable = self.engine.variable(variable_name)
 
-        fig, ax = plt.subplots()
-        for term in variable.terms:
-            term_values = [
-                term.membership(x)
-                for x in np.linspace(variable.minimum, variable.maximum, 100)
-            ]
-            ax.plot(
-                np.linspace(variable.minimum, variable.maximum, 100),
-                term_values,
-                label=term.name,
-            )
+        show = ax is None
+        if show:
+            fig, ax = plt.subplots()
+        else:
+            ax.cla()
+
+        handles = self._plot_terms(ax, variable)
 
         ax.set_title(f"Membership Functions of {variable_name}")
         ax.set_xlabel("Values")
         ax.set_ylabel("Membership")
-        ax.legend()
-        plt.show()
+        ax.legend(handles=handles)
 
-    def plot_all_inputs(self) -> None:
+        if show:
+            plt.show()
+
+    def plot_all_inputs(
+        self,
+        axs: "Iterable[matplotlib.axes.Axes] | None" = None,
+    ) -> None:
         """
         Plot the membership functions of all input variables.
+
+        Parameters
+        ----------
+        axs : Iterable[matplotlib.axes.Axes], optional
+            One axes per input variable to draw on, cleared before
+            plotting. If given, the plot is not shown, so the caller can
+            reuse the same figure. If not given, a new figure is created
+            and shown.
         """
-        n = len(self.engine.input_variables)
-        fig, axs = plt.subplots(n, 1, figsize=(8, 3 * n))
+        import matplotlib.pyplot as plt
 
-        if n == 1:
-            axs = [axs]  # Ensure axs is iterable
+        n = len(self.engine.input_variables)
+        show = axs is None
+        if show:
+            fig, axs = plt.subplots(n, 1, figsize=(8, 3 * n), squeeze=False)
+            axs = axs[:, 0]
+        else:
+            axs = list(axs)
+            for ax in axs:
+                ax.cla()
 
         for i, variable in enumerate(self.engine.input_variables):
             variable_name = variable.name
-            for term in variable.terms:
-                term_values = [
-                    term.membership(x)
-                    for x in np.linspace(variable.minimum, variable.maximum, 100)
-                ]
-                axs[i].plot(
-                    np.linspace(variable.minimum, variable.maximum, 100),
-                    term_values,
-                    label=term.name,
-                )
+            handles = self._plot_terms(axs[i], variable)
             axs[i].set_title(f"Membership Functions of {variable_name}")
             axs[i].set_xlabel("Values")
             axs[i].set_ylabel("Membership")
-            axs[i].legend()
+            axs[i].legend(handles=handles)
 
-        plt.tight_layout()
-        plt.show()
+        if show:
+            plt.tight_layout()
+            plt.show()
 
-    def plot_all_outputs(self) -> None:
+    def plot_all_outputs(
+        self,
+        axs: "Iterable[matplotlib.axes.Axes] | None" = None,
+    ) -> None:
         """
         Plot the membership functions of all output variables.
+
+        Parameters
+        ----------
+        axs : Iterable[matplotlib.axes.Axes], optional
+            One axes per output variable to draw on, cleared before
+            plotting. If given, the plot is not shown, so the caller can
+            reuse the same figure. If not given, a new figure is created
+            and shown.
         """
-        n = len(self.engine.output_variables)
-        fig, axs = plt.subplots(n, 1, figsize=(8, 3 * n))
+        import matplotlib.pyplot as plt
 
-        if n == 1:
-            axs = [axs]  # Ensure axs is iterable
+        n = len(self.engine.output_variables)
+        show = axs is None
+        if show:
+            fig, axs = plt.subplots(n, 1, figsize=(8, 3 * n), squeeze=False)
+            axs = axs[:, 0]
+        else:
+            axs = list(axs)
+            for ax in axs:
+                ax.cla()
 
         for i, variable in enumerate(self.engine.output_variables):
             variable_name = variable.name
-            for term in variable.terms:
-                term_values = [
-                    term.membership(x)
-                    for x in np.linspace(variable.minimum, variable.maximum, 100)
-                ]
-                axs[i].plot(
-                    np.linspace(variable.minimum, variable.maximum, 100),
-                    term_values,
-                    label=term.name,
-                )
+            handles = self._plot_terms(axs[i], variable)
             axs[i].set_title(f"Membership Functions of {variable_name}")
             axs[i].set_xlabel("Values")
             axs[i].set_ylabel("Membership")
-            axs[i].legend()
+            axs[i].legend(handles=handles)
 
-        plt.tight_layout()
-        plt.show()
+        if show:
+            plt.tight_layout()
+            plt.show()
 
     def plot_all_variables(self) -> None:
         """
         Plot the membership functions of all input and output variables together.
         """
+        import matplotlib.pyplot as plt
+
         n_inputs = len(self.engine.input_variables)
         n_outputs = len(self.engine.output_variables)
         total_vars = n_inputs + n_outputs
         # fig, axs = plt.subplots(total_vars, 1, figsize=(8, 2.5 * total_vars))
-        fig, axs = plt.subplots(1, total_vars, figsize=(6 * total_vars, 4))
-
-        if total_vars == 1:
-            axs = [axs]  # Ensure axs is iterable
+        fig, axs = plt.subplots(
+            1, total_vars, figsize=(6 * total_vars, 4), squeeze=False
+        )
+        axs = axs[0]
 
-        # Plot input variables
-        for i, variable in enumerate(self.engine.input_variables):
-            variable_name = variable.name
-            for term in variable.terms:
-                term_values = [
-                    term.membership(x)
-                    for x in np.linspace(variable.minimum, variable.maximum, 100)
-                ]
-                axs[i].plot(
-                    np.linspace(variable.minimum, variable.maximum, 100),
-                    term_values,
-                    label=term.name,
-                )
-            axs[i].set_title(f"Membership Functions of {variable_name} (Input)")
+        # Plot input and output variables in a single pass
+        variables = chain(
+            zip(self.engine.input_variables, repeat("Input")),
+            zip(self.engine.output_variables, repeat("Output")),
+        )
+        for i, (variable, kind) in enumerate(variables):
+            handles = self._plot_terms(axs[i], variable)
+            axs[i].set_title(f"Membership Functions of {variable.name} ({kind})")
             axs[i].set_xlabel("Values")
             axs[i].set_ylabel("Membership")
-            axs[i].legend()
-
-        # Plot output variables
-        for i, variable in enumerate(self.engine.output_variables):
-            variable_name = variable.name
-            for term in variable.terms:
-                term_values = [
-                    term.membership(x)
-                    for x in np.linspace(variable.minimum, variable.maximum, 100)
-                ]
-                axs[n_inputs + i].plot(
-                    np.linspace(variable.minimum, variable.maximum, 100),
-                    term_values,
-                    label=term.name,
-                )
-            axs[n_inputs + i].set_title(
-                f"Membership Functions of {variable_name} (Output)"
-            )
-            axs[n_inputs + i].set_xlabel("Values")
-            axs[n_inputs + i].set_ylabel("Membership")
-            axs[n_inputs + i].legend()
+            axs[i].legend(handles=handles)
 
         plt.tight_layout()
         plt.show()